@@ -5,12 +5,24 @@ VS Code Integration Tools
 Enhanced VS Code tools with Rich formatting, permission management, and availability checks
 """
 
-import json
-import requests
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import functools
+import importlib.util
+import inspect
+import httpx
+import orjson
 import subprocess
-import socket
-from typing import Optional
-from langchain_core.tools import tool
+import threading
+import time
+import weakref
+from typing import Any, Optional
+from langchain_core.tools import StructuredTool
+from pygments.lexer import Lexer
+from pygments.lexers import get_lexer_by_name
+from pygments.util import ClassNotFound
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
@@ -26,15 +38,63 @@ HEADERS = {
     'Content-Type': 'application/json'
 }
 
-# Initialize Rich console
-console = Console()
+# Short connect timeout (the API is on localhost), longer read timeout for real work
+HTTP_TIMEOUT = httpx.Timeout(5.0, connect=0.5)
+HTTP_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+
+# HTTP/2 needs the optional 'h2' package and is only negotiated over TLS, so against
+# the plain http:// API requests share HTTP/1.1 keep-alive connections instead
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+# Shared HTTP client so connections to the extension API are reused
+_CLIENT = httpx.Client(
+    http2=HTTP2_ENABLED,
+    base_url=VSCODE_HTTP_URL,
+    headers=HEADERS,
+    timeout=HTTP_TIMEOUT,
+    limits=HTTP_LIMITS
+)
+atexit.register(_CLIENT.close)
+
+# Async clients for tool calls, one per event loop; created lazily because an
+# async client's connections are bound to the loop that opened them
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+# Set while a tool runs for a synchronous caller; its requests then use _CLIENT
+_sync_call = contextvars.ContextVar("vscode_sync_call", default=False)
+
+# Serializes interactive permission prompts across threads and event loops
+_permission_lock = threading.Lock()
+
+# Recent permission decisions keyed by (type, prompt text). Read approvals are reused for a
+# short time; write approvals only answer identical requests already waiting on the prompt
+PERMISSION_CACHE_TTL = 30.0
+_permission_cache: dict[tuple[PermissionType, str], tuple[float, bool]] = {}
+
+# How long a VS Code API probe result is reused before probing again (seconds)
+VSCODE_API_CACHE_TTL = 5.0
+_vscode_api_cache: Optional[tuple[float, bool]] = None
+
+# Read-only context responses are reused for this long (seconds); they are stable on this timescale
+RESPONSE_CACHE_TTL = 0.5
+_response_cache: dict[str, tuple[float, Any]] = {}
+
+# Files larger than this (in characters) are shown as plain text instead of being highlighted
+MAX_HIGHLIGHT_CHARS = 200_000
+
+# Initialize Rich console; panel bodies carry explicit markup, so skip the regex auto-highlighter
+console = Console(highlight=False)
+
+# Syntax theme resolved once and shared by every highlighted panel
+_SYNTAX_THEME = Syntax.get_theme("monokai")
 
 class VSCodeAvailabilityError(Exception):
     """Exception raised when VS Code is not available."""
     pass
 
+@functools.lru_cache(maxsize=1)
 def check_code_command() -> bool:
-    """Check if 'code' command is available."""
+    """Check if 'code' command is available (cached for the lifetime of the process)."""
     try:
         result = subprocess.run(
             ['code', '--version'],
@@ -47,24 +107,29 @@ def check_code_command() -> bool:
         return False
 
 def check_vscode_api() -> bool:
-    """Check if VS Code extension API is running on localhost:8090."""
+    """Check if VS Code extension API is running on localhost:8090 (cached for a few seconds)."""
+    global _vscode_api_cache
+    now = time.monotonic()
+    if _vscode_api_cache is not None and now - _vscode_api_cache[0] < VSCODE_API_CACHE_TTL:
+        return _vscode_api_cache[1]
+    result = _probe_vscode_api()
+    _vscode_api_cache = (now, result)
+    return result
+
+def reset_vscode_api_cache():
+    """Forget the cached VS Code API probe so the next check hits the API."""
+    global _vscode_api_cache
+    _vscode_api_cache = None
+
+def _probe_vscode_api() -> bool:
+    """Probe the VS Code extension API on localhost:8090."""
     try:
-        # Try to connect to the API endpoint
-        response = requests.get(
-            f'{VSCODE_HTTP_URL}/health', 
-            timeout=3
-        )
+        # A single short probe is enough on localhost; an open port without a
+        # working /health endpoint would fail on the real request anyway
+        response = _CLIENT.get('/health', timeout=0.5)
         return response.status_code == 200
     except:
-        # Fallback: check if port is open
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(2)
-            result = sock.connect_ex(('localhost', 8090))
-            sock.close()
-            return result == 0
-        except:
-            return False
+        return False
 
 def check_vscode_availability() -> tuple[bool, str]:
     """
@@ -91,6 +156,183 @@ def ensure_vscode_available():
     if not is_available:
         raise VSCodeAvailabilityError(message)
 
+def _get_async_client() -> httpx.AsyncClient:
+    """Return the async client for the running event loop, creating it if needed."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            base_url=VSCODE_HTTP_URL,
+            headers=HEADERS,
+            timeout=HTTP_TIMEOUT,
+            limits=HTTP_LIMITS
+        )
+        _async_clients[loop] = client
+    return client
+
+async def close_async_client():
+    """Close the running event loop's async client (call before the loop shuts down)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+async def _blocking(func, *args):
+    """Run a blocking call directly for synchronous callers, otherwise on a worker thread."""
+    if _sync_call.get():
+        return func(*args)
+    return await asyncio.to_thread(func, *args)
+
+async def _request(method: str, path: str, **kwargs) -> tuple[int, bytes]:
+    """
+    Send a request to the VS Code extension API.
+    
+    Synchronous tool calls use the pooled _CLIENT; async calls use the running
+    loop's async client.
+    
+    Returns:
+        tuple: (status_code, response_body)
+    """
+    if _sync_call.get():
+        response = _CLIENT.request(method, path, **kwargs)
+    else:
+        response = await _get_async_client().request(method, path, **kwargs)
+    return response.status_code, response.content
+
+async def _cached_get(path: str, ttl: float = RESPONSE_CACHE_TTL) -> tuple[int, Any]:
+    """
+    GET a read-only endpoint, reusing a successful decoded response for ttl seconds.
+    
+    Returns:
+        tuple: (status_code, decoded_json or None if the request failed)
+    """
+    entry = _response_cache.get(path)
+    if entry is not None and time.monotonic() - entry[0] < ttl:
+        return 200, entry[1]
+    
+    status, body = await _request("GET", path)
+    if status != 200:
+        return status, None
+    data = orjson.loads(body)
+    _response_cache[path] = (time.monotonic(), data)
+    return 200, data
+
+def clear_response_cache():
+    """Forget cached context responses (done automatically after file writes)."""
+    _response_cache.clear()
+
+def _is_ndjson(content_type: str) -> bool:
+    """Check whether a Content-Type header names newline-delimited JSON."""
+    return content_type.split(";")[0].strip() == "application/x-ndjson"
+
+def _select_lines(line_infos, start_line: int, end_line: Optional[int]) -> str:
+    """Join the content of the {"lineNumber", "content"} objects within the requested range."""
+    lines = []
+    for line_info in line_infos:
+        line_num = line_info.get('lineNumber', 0)
+        if end_line is not None and line_num > end_line:
+            break
+        if line_num >= start_line:
+            lines.append(line_info.get('content', ''))
+    return "\n".join(lines) if lines else 'No content'
+
+async def _aselect_lines(line_infos, start_line: int, end_line: Optional[int]) -> str:
+    """Async counterpart of _select_lines, stopping the stream once past end_line."""
+    lines = []
+    async for line_info in line_infos:
+        line_num = line_info.get('lineNumber', 0)
+        if end_line is not None and line_num > end_line:
+            break
+        if line_num >= start_line:
+            lines.append(line_info.get('content', ''))
+    return "\n".join(lines) if lines else 'No content'
+
+async def _iter_ndjson(response: httpx.Response):
+    """Yield one decoded object per line of an application/x-ndjson response as it arrives."""
+    async for line in response.aiter_lines():
+        if line.strip():
+            yield orjson.loads(line)
+
+async def _read_file_content(params: dict, start_line: int, end_line: Optional[int]) -> tuple[int, Optional[str]]:
+    """
+    Read file content from the extension API, keeping only the requested lines.
+    
+    Servers that support it stream one {"lineNumber", "content"} object per line
+    (application/x-ndjson), so only the requested range is ever held in memory.
+    
+    Returns:
+        tuple: (status_code, content or None if the request failed)
+    """
+    headers = {"Accept": "application/x-ndjson, application/json"}
+    if _sync_call.get():
+        with _CLIENT.stream("GET", "/file/read", params=params, headers=headers) as response:
+            if response.status_code != 200:
+                return response.status_code, None
+            if _is_ndjson(response.headers.get("Content-Type", "")):
+                line_infos = (orjson.loads(line) for line in response.iter_lines() if line.strip())
+                return 200, _select_lines(line_infos, start_line, end_line)
+            return 200, orjson.loads(response.read()).get('content', 'No content')
+    async with _get_async_client().stream("GET", "/file/read", params=params, headers=headers) as response:
+        if response.status_code != 200:
+            return response.status_code, None
+        if _is_ndjson(response.headers.get("Content-Type", "")):
+            return 200, await _aselect_lines(_iter_ndjson(response), start_line, end_line)
+        return 200, orjson.loads(await response.aread()).get('content', 'No content')
+
+async def ensure_vscode_available_async():
+    """Run the blocking availability checks without blocking the event loop."""
+    await _blocking(ensure_vscode_available)
+
+def clear_permission_cache():
+    """
+    Forget cached permission decisions.
+    
+    The agent should call this at the start of each user turn so read approvals never
+    carry over between turns; PERMISSION_CACHE_TTL only bounds them if it doesn't.
+    """
+    _permission_cache.clear()
+
+def _prompt_permission(permission_type: PermissionType, description: str, requested_at: float) -> bool:
+    """Prompt for permission one prompt at a time, reusing a matching decision when allowed."""
+    key = (permission_type, description)
+    with _permission_lock:
+        entry = _permission_cache.get(key)
+        if entry is not None:
+            decided_at, allowed = entry
+            # Decided while this request was waiting: the same prompt, asked concurrently
+            if decided_at >= requested_at:
+                return allowed
+            if (permission_type != PermissionType.FILE_WRITE
+                    and time.monotonic() - decided_at < PERMISSION_CACHE_TTL):
+                return allowed
+        allowed = permission_manager.get_permission(permission_type, description)
+        _permission_cache[key] = (time.monotonic(), allowed)
+        return allowed
+
+async def _check_permission(permission_type: PermissionType, description: str) -> bool:
+    """
+    Ask for permission without blocking the event loop.
+    
+    Identical concurrent requests share one prompt, and read approvals are reused for
+    PERMISSION_CACHE_TTL seconds. A write approval covers only the requests that were
+    waiting on its prompt, never a later write.
+    """
+    return await _blocking(_prompt_permission, permission_type, description, time.monotonic())
+
+@functools.lru_cache(maxsize=32)
+def _get_lexer(name: str) -> Lexer:
+    """Return a Pygments lexer for a language name or file extension, cached by name."""
+    # Same options Rich uses, so leading blank lines are kept and line numbers line up
+    options = {"stripnl": False, "ensurenl": True, "tabsize": 4}
+    try:
+        return get_lexer_by_name(name, **options)
+    except ClassNotFound:
+        return get_lexer_by_name("text", **options)
+
+def _make_syntax(content: str, name: str) -> Syntax:
+    """Build a line-numbered Syntax renderable using the cached lexer and theme."""
+    return Syntax(content, _get_lexer(name), theme=_SYNTAX_THEME, line_numbers=True)
+
 def display_rich_error(error_msg: str) -> str:
     """Display error message with Rich formatting."""
     console.print(Panel(
@@ -109,110 +351,139 @@ def display_rich_success(success_msg: str) -> str:
     ))
     return success_msg
 
+def _run_sync(coroutine_func):
+    """Wrap an async tool implementation so synchronous callers can run it."""
+    @functools.wraps(coroutine_func)
+    def wrapper(*args, **kwargs):
+        async def run():
+            # Scoped to this call's task: requests go through the pooled _CLIENT
+            _sync_call.set(True)
+            return await coroutine_func(*args, **kwargs)
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(run())
+        # Called synchronously from inside a running loop: run on another thread
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, run()).result()
+    return wrapper
+
+def _tool(coroutine_func) -> StructuredTool:
+    """Create a LangChain tool from an async implementation that supports invoke() and ainvoke()."""
+    return StructuredTool.from_function(func=_run_sync(coroutine_func), coroutine=coroutine_func)
 
-@tool
-def vscode_get_context() -> str:
+def _vscode_tool(error_prefix: str):
+    """
+    Decorator for VS Code tools that checks availability and reports failures as Rich errors.
+    
+    Args:
+        error_prefix: Message prefix for unexpected errors, formatted with the tool's
+            arguments (e.g. "Error reading file {file_path}")
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                await ensure_vscode_available_async()
+                return await func(*args, **kwargs)
+            except VSCodeAvailabilityError as e:
+                return display_rich_error(str(e))
+            except Exception as e:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                error_msg = f"{error_prefix.format(**bound.arguments)}: {str(e)}"
+                return display_rich_error(error_msg)
+        return wrapper
+    return decorator
+
+
+@_tool
+@_vscode_tool("Error getting VS Code context")
+async def vscode_get_context() -> str:
     """Get the current VS Code editor context including active file, selection, workspace, and open tabs.
     
     Note: Only works when VS Code is installed and extension API is running on localhost:8090.
     """
-    try:
-        ensure_vscode_available()
-        
-        response = requests.get(f"{VSCODE_HTTP_URL}/context", headers=HEADERS, timeout=10)
-        if response.status_code == 200:
-            context = response.json()
-            
-            # Create rich formatted output
-            context_info = f"""[bold cyan]VS Code Context:[/bold cyan]
+    status, context = await _cached_get("/context")
+    if status == 200:
+        # Create rich formatted output
+        context_info = f"""[bold cyan]VS Code Context:[/bold cyan]
 [bold]Active File:[/bold] {context.get('activeFile', 'None')}
 [bold]Language:[/bold] {context.get('language', 'Unknown')}
 [bold]Workspace:[/bold] {context.get('workspace', 'None')}
 [bold]Selection:[/bold] {context.get('selection', {}).get('text', 'No selection')}
 [bold]Open Tabs:[/bold] {len(context.get('openTabs', []))} tabs"""
-            
-            console.print(Panel(context_info, title="[cyan]VS Code Context[/cyan]", border_style="cyan"))
-            return context_info
-        else:
-            error_msg = f"Error getting VS Code context: HTTP {response.status_code}"
-            return display_rich_error(error_msg)
-            
-    except VSCodeAvailabilityError as e:
-        return display_rich_error(str(e))
-    except Exception as e:
-        error_msg = f"Error getting VS Code context: {str(e)}"
+        
+        console.print(Panel(context_info, title="[cyan]VS Code Context[/cyan]", border_style="cyan"))
+        return context_info
+    else:
+        error_msg = f"Error getting VS Code context: HTTP {status}"
         return display_rich_error(error_msg)
 
 
-@tool  
-def vscode_get_selection() -> str:
+@_tool
+@_vscode_tool("Error getting selection context")
+async def vscode_get_selection() -> str:
     """Get detailed context of the current selection in VS Code, including surrounding lines with line numbers.
     
     Note: Only works when VS Code is installed and extension API is running on localhost:8090.
     """
-    try:
-        ensure_vscode_available()
+    status, context = await _cached_get("/selection-context")
+    if status == 200:
+        if not context.get('hasActiveEditor', False):
+            return display_rich_error("No active editor in VS Code")
         
-        response = requests.get(f"{VSCODE_HTTP_URL}/selection-context", headers=HEADERS, timeout=10)
-        if response.status_code == 200:
-            context = response.json()
-            
-            if not context.get('hasActiveEditor', False):
-                return display_rich_error("No active editor in VS Code")
-            
-            selection = context.get('selection', {})
-            file_info = context.get('activeFile', 'Unknown file')
-            language = context.get('language', 'Unknown')
-            context_info = context.get('context', {})
-            
-            # Rich formatted selection info
-            selection_text = f"""[bold]File:[/bold] {file_info}
+        selection = context.get('selection', {})
+        file_info = context.get('activeFile', 'Unknown file')
+        language = context.get('language', 'Unknown')
+        context_info = context.get('context', {})
+        
+        # Rich formatted selection info
+        selection_text = f"""[bold]File:[/bold] {file_info}
 [bold]Language:[/bold] {language}
 [bold]Total Lines:[/bold] {context_info.get('totalLines', 'Unknown')}
 [bold]Selection Lines:[/bold] {selection.get('startLine', 'Unknown')} to {selection.get('endLine', 'Unknown')}
 [bold]Columns:[/bold] {selection.get('startColumn', 'Unknown')} to {selection.get('endColumn', 'Unknown')}"""
 
-            console.print(Panel(selection_text, title="[yellow]Selection Info[/yellow]", border_style="yellow"))
-            
-            # Show selected text with syntax highlighting
-            selected_text = selection.get('text', 'No selection')
-            if selected_text != 'No selection':
-                try:
-                    syntax = Syntax(selected_text, language.lower(), theme="monokai", line_numbers=True)
-                    console.print(Panel(syntax, title="[green]Selected Code[/green]", border_style="green"))
-                except:
-                    console.print(Panel(selected_text, title="[green]Selected Text[/green]", border_style="green"))
-            
-            # Show context lines
-            lines = context_info.get('lines', [])
-            if lines:
-                context_display = ""
-                for line_info in lines:
-                    line_num = line_info.get('lineNumber', 0)
-                    content = line_info.get('content', '')
-                    is_selected = line_info.get('isSelected', False)
-                    
-                    if is_selected:
-                        context_display += f"[bold yellow]→ {line_num:3d}:[/bold yellow] {content}\n"
-                    else:
-                        context_display += f"   {line_num:3d}: {content}\n"
+        console.print(Panel(selection_text, title="[yellow]Selection Info[/yellow]", border_style="yellow"))
+        
+        # Show selected text with syntax highlighting
+        selected_text = selection.get('text', 'No selection')
+        if selected_text != 'No selection':
+            try:
+                syntax = _make_syntax(selected_text, language.lower())
+                console.print(Panel(syntax, title="[green]Selected Code[/green]", border_style="green"))
+            except:
+                console.print(Panel(selected_text, title="[green]Selected Text[/green]", border_style="green"))
+        
+        # Show context lines
+        lines = context_info.get('lines', [])
+        if lines:
+            context_display = ""
+            for line_info in lines:
+                line_num = line_info.get('lineNumber', 0)
+                content = line_info.get('content', '')
+                is_selected = line_info.get('isSelected', False)
                 
-                console.print(Panel(context_display, title="[blue]Context Lines[/blue]", border_style="blue"))
+                if is_selected:
+                    context_display += f"[bold yellow]→ {line_num:3d}:[/bold yellow] {content}\n"
+                else:
+                    context_display += f"   {line_num:3d}: {content}\n"
             
-            return "VS Code selection context displayed above"
-        else:
-            error_msg = f"Error getting selection context: HTTP {response.status_code}"
-            return display_rich_error(error_msg)
-            
-    except VSCodeAvailabilityError as e:
-        return display_rich_error(str(e))
-    except Exception as e:
-        error_msg = f"Error getting selection context: {str(e)}"
+            console.print(Panel(context_display, title="[blue]Context Lines[/blue]", border_style="blue"))
+        
+        return "VS Code selection context displayed above"
+    else:
+        error_msg = f"Error getting selection context: HTTP {status}"
         return display_rich_error(error_msg)
 
 
-@tool
-def vscode_list_files(pattern: str = "**/*") -> str:
+@_tool
+@_vscode_tool("Error listing workspace files")
+async def vscode_list_files(pattern: str = "**/*") -> str:
     """List files in the VS Code workspace matching a glob pattern.
     
     Args:
@@ -220,50 +491,43 @@ def vscode_list_files(pattern: str = "**/*") -> str:
         
     Note: Only works when VS Code is installed and extension API is running on localhost:8090.
     """
-    try:
-        ensure_vscode_available()
+    status, body = await _request("GET", "/workspace/files", params={"pattern": pattern})
+    if status == 200:
+        data = orjson.loads(body)
+        files = data.get('files', [])
+        total = data.get('total', 0)
         
-        response = requests.get(
-            f"{VSCODE_HTTP_URL}/workspace/files",
-            params={"pattern": pattern},
-            headers=HEADERS,
-            timeout=10
-        )
-        if response.status_code == 200:
-            data = response.json()
-            files = data.get('files', [])
-            total = data.get('total', 0)
-            
-            if total == 0:
-                return display_rich_error(f"No files found matching pattern '{pattern}'")
-            
-            # Limit display to first 50 files
-            if total > 50:
-                files_display = files[:50]
-                truncated_msg = f"\n[dim]... and {total - 50} more files[/dim]"
-            else:
-                files_display = files
-                truncated_msg = ""
-                
-            files_list = "\n".join([f"{i+1:2d}. {file}" for i, file in enumerate(files_display)])
-            
-            files_info = f"[bold]Pattern:[/bold] {pattern}\n[bold]Total Found:[/bold] {total}\n\n{files_list}{truncated_msg}"
-            console.print(Panel(files_info, title="[cyan]Workspace Files[/cyan]", border_style="cyan"))
-            
-            return f"Found {total} files matching pattern '{pattern}' (displayed in panel above)"
+        if total == 0:
+            return display_rich_error(f"No files found matching pattern '{pattern}'")
+        
+        # Limit display to first 50 files
+        if total > 50:
+            files_display = files[:50]
+            truncated_msg = f"\n... and {total - 50} more files"
         else:
-            error_msg = f"Error listing workspace files: HTTP {response.status_code}"
-            return display_rich_error(error_msg)
+            files_display = files
+            truncated_msg = ""
             
-    except VSCodeAvailabilityError as e:
-        return display_rich_error(str(e))
-    except Exception as e:
-        error_msg = f"Error listing workspace files: {str(e)}"
+        files_list = "\n".join(f"{i:2d}. {file}" for i, file in enumerate(files_display, 1))
+        
+        # Assemble styled spans directly rather than building a markup string for Rich to re-parse
+        files_info = Text.assemble(
+            ("Pattern:", "bold"), f" {pattern}\n",
+            ("Total Found:", "bold"), f" {total}\n\n",
+            files_list,
+            (truncated_msg, "dim")
+        )
+        console.print(Panel(files_info, title="[cyan]Workspace Files[/cyan]", border_style="cyan"))
+        
+        return f"Found {total} files matching pattern '{pattern}' (displayed in panel above)"
+    else:
+        error_msg = f"Error listing workspace files: HTTP {status}"
         return display_rich_error(error_msg)
 
 
-@tool
-def vscode_read_file(file_path: str, start_line: int = 1, end_line: Optional[int] = None) -> str:
+@_tool
+@_vscode_tool("Error reading file {file_path}")
+async def vscode_read_file(file_path: str, start_line: int = 1, end_line: Optional[int] = None) -> str:
     """Read content from a file in the VS Code workspace.
     
     Args:
@@ -273,52 +537,41 @@ def vscode_read_file(file_path: str, start_line: int = 1, end_line: Optional[int
         
     Note: Only works when VS Code is installed and extension API is running on localhost:8090.
     """
-    try:
-        ensure_vscode_available()
+    # Check permission for file read
+    if not await _check_permission(
+        PermissionType.FILE_OPERATIONS, 
+        f"Read file: {file_path}"
+    ):
+        return display_rich_error("Permission denied for file read operation")
+    
+    params = {"path": file_path, "startLine": start_line}
+    if end_line is not None:
+        params["endLine"] = end_line
         
-        # Check permission for file read
-        if not permission_manager.get_permission(
-            PermissionType.FILE_OPERATIONS, 
-            f"Read file: {file_path}"
-        ):
-            return display_rich_error("Permission denied for file read operation")
+    status, content = await _read_file_content(params, start_line, end_line)
+    if status == 200:
+        title = f"[green]{file_path}[/green]"
         
-        params = {"path": file_path, "startLine": start_line}
-        if end_line is not None:
-            params["endLine"] = end_line
-            
-        response = requests.get(
-            f"{VSCODE_HTTP_URL}/file/read",
-            params=params,
-            headers=HEADERS,
-            timeout=10
-        )
-        if response.status_code == 200:
-            data = response.json()
-            content = data.get('content', 'No content')
-            
-            # Display with syntax highlighting
+        # Display with syntax highlighting; very large files skip tokenization
+        if len(content) > MAX_HIGHLIGHT_CHARS:
+            console.print(Panel(Text(content), title=title, border_style="green"))
+        else:
             try:
                 file_ext = file_path.split('.')[-1] if '.' in file_path else 'txt'
-                syntax = Syntax(content, file_ext, theme="monokai", line_numbers=True)
-                console.print(Panel(syntax, title=f"[green]{file_path}[/green]", border_style="green"))
+                syntax = _make_syntax(content, file_ext)
+                console.print(Panel(syntax, title=title, border_style="green"))
             except:
-                console.print(Panel(content, title=f"[green]{file_path}[/green]", border_style="green"))
-            
-            return f"File content for {file_path} displayed above"
-        else:
-            error_msg = f"Error reading file {file_path}: HTTP {response.status_code}"
-            return display_rich_error(error_msg)
-            
-    except VSCodeAvailabilityError as e:
-        return display_rich_error(str(e))
-    except Exception as e:
-        error_msg = f"Error reading file {file_path}: {str(e)}"
+                console.print(Panel(content, title=title, border_style="green"))
+        
+        return f"File content for {file_path} displayed above"
+    else:
+        error_msg = f"Error reading file {file_path}: HTTP {status}"
         return display_rich_error(error_msg)
 
 
-@tool
-def vscode_create_file(filename: str, content: str) -> str:
+@_tool
+@_vscode_tool("Error creating file {filename}")
+async def vscode_create_file(filename: str, content: str) -> str:
     """Create a new file with the specified content in VS Code workspace.
     
     Args:
@@ -327,72 +580,50 @@ def vscode_create_file(filename: str, content: str) -> str:
         
     Note: Only works when VS Code is installed and extension API is running on localhost:8090.
     """
+    # Check permission for file creation
+    if not await _check_permission(
+        PermissionType.FILE_WRITE, 
+        f"Create file: {filename}"
+    ):
+        return display_rich_error("Permission denied for file creation")
+    
+    # Show content preview
     try:
-        ensure_vscode_available()
-        
-        # Check permission for file creation
-        if not permission_manager.get_permission(
-            PermissionType.FILE_WRITE, 
-            f"Create file: {filename}"
-        ):
-            return display_rich_error("Permission denied for file creation")
-        
-        # Show content preview
-        try:
-            file_ext = filename.split('.')[-1] if '.' in filename else 'txt'
-            syntax = Syntax(content, file_ext, theme="monokai", line_numbers=True)
-            console.print(Panel(
-                syntax, 
-                title=f"[yellow]Preview: {filename}[/yellow]",
-                border_style="yellow"
-            ))
-        except:
-            console.print(Panel(
-                content,
-                title=f"[yellow]Preview: {filename}[/yellow]", 
-                border_style="yellow"
-            ))
-        
-        # Try to show preview in VS Code
-        try:
-            preview_response = requests.get(
-                f"{VSCODE_HTTP_URL}/preview",
-                params={
-                    "title": f"📄 New file: {filename}",
-                    "filename": filename,
-                    "content": content
-                },
-                headers=HEADERS,
-                timeout=10
-            )
-        except:
-            pass  # Preview is optional
-        
-        # Create the file
-        response = requests.post(
-            f"{VSCODE_HTTP_URL}/file/create",
-            json={"path": filename, "content": content},
-            headers=HEADERS,
-            timeout=10
-        )
-        
-        if response.status_code == 200:
-            success_msg = f"Successfully created file: {filename}"
-            return display_rich_success(success_msg)
-        else:
-            data = response.json()
-            error_msg = f"Error creating file {filename}: {data.get('error', 'Unknown error')}"
-            return display_rich_error(error_msg)
-            
-    except VSCodeAvailabilityError as e:
-        return display_rich_error(str(e))
-    except Exception as e:
-        error_msg = f"Error creating file {filename}: {str(e)}"
+        file_ext = filename.split('.')[-1] if '.' in filename else 'txt'
+        syntax = _make_syntax(content, file_ext)
+        console.print(Panel(
+            syntax, 
+            title=f"[yellow]Preview: {filename}[/yellow]",
+            border_style="yellow"
+        ))
+    except:
+        console.print(Panel(
+            content,
+            title=f"[yellow]Preview: {filename}[/yellow]", 
+            border_style="yellow"
+        ))
+    
+    # Create the file; withPreview asks VS Code to show the preview in the
+    # same request, answering {"previewShown": ..., "created": ...}
+    status, body = await _request(
+        "POST",
+        "/file/create",
+        content=orjson.dumps({"path": filename, "content": content, "withPreview": True})
+    )
+    
+    if status == 200:
+        clear_response_cache()
+        success_msg = f"Successfully created file: {filename}"
+        return display_rich_success(success_msg)
+    else:
+        data = orjson.loads(body)
+        error_msg = f"Error creating file {filename}: {data.get('error', 'Unknown error')}"
         return display_rich_error(error_msg)
 
 
-@tool
-def vscode_edit_file(filename: str, old_text: str, new_text: str) -> str:
+@_tool
+@_vscode_tool("Error editing file {filename}")
+async def vscode_edit_file(filename: str, old_text: str, new_text: str) -> str:
     """Edit an existing file by replacing old text with new text in VS Code workspace.
     
     Args:
@@ -402,75 +633,57 @@ def vscode_edit_file(filename: str, old_text: str, new_text: str) -> str:
         
     Note: Only works when VS Code is installed and extension API is running on localhost:8090.
     """
-    try:
-        ensure_vscode_available()
-        
-        # Check permission for file editing
-        if not permission_manager.get_permission(
-            PermissionType.FILE_WRITE,
-            f"Edit file: {filename}"
-        ):
-            return display_rich_error("Permission denied for file edit operation")
-        
-        # Show diff preview in console
-        console.print(Panel(
-            f"[bold]File:[/bold] {filename}\n[bold red]- Old text:[/bold red]\n{old_text}\n\n[bold green]+ New text:[/bold green]\n{new_text}",
-            title="[yellow]Proposed Changes[/yellow]",
-            border_style="yellow"
-        ))
-        
-        # Try to show diff in VS Code
-        try:
-            diff_response = requests.get(
-                f"{VSCODE_HTTP_URL}/diff",
-                params={
-                    "left": f"{filename} (original)",
-                    "right": f"{filename} (proposed)",
-                    "title": f"Edit file: {filename}",
-                    "leftContent": old_text,
-                    "rightContent": new_text
-                },
-                headers=HEADERS,
-                timeout=10
-            )
-        except:
-            pass  # Diff preview is optional
-
-        # Perform the edit
-        response = requests.post(
-            f"{VSCODE_HTTP_URL}/file/edit",
-            json={
-                "path": filename,
-                "oldContent": old_text,
-                "newContent": new_text
-            },
-            headers=HEADERS,
-            timeout=10
-        )
-        
-        if response.status_code == 200:
-            success_msg = f"Successfully edited file: {filename}"
-            return display_rich_success(success_msg)
-        else:
-            data = response.json()
-            error_msg = f"Error editing file {filename}: {data.get('error', 'Unknown error')}"
-            return display_rich_error(error_msg)
-            
-    except VSCodeAvailabilityError as e:
-        return display_rich_error(str(e))
-    except Exception as e:
-        error_msg = f"Error editing file {filename}: {str(e)}"
+    # Check permission for file editing
+    if not await _check_permission(
+        PermissionType.FILE_WRITE,
+        f"Edit file: {filename}"
+    ):
+        return display_rich_error("Permission denied for file edit operation")
+    
+    # Show diff preview in console
+    console.print(Panel(
+        f"[bold]File:[/bold] {filename}\n[bold red]- Old text:[/bold red]\n{old_text}\n\n[bold green]+ New text:[/bold green]\n{new_text}",
+        title="[yellow]Proposed Changes[/yellow]",
+        border_style="yellow"
+    ))
+    
+    # Perform the edit; withPreview asks VS Code to show the diff in the
+    # same request, answering {"previewShown": ..., "edited": ...}
+    status, body = await _request(
+        "POST",
+        "/file/edit",
+        content=orjson.dumps({
+            "path": filename,
+            "oldContent": old_text,
+            "newContent": new_text,
+            "withPreview": True
+        })
+    )
+    
+    if status == 200:
+        clear_response_cache()
+        success_msg = f"Successfully edited file: {filename}"
+        return display_rich_success(success_msg)
+    else:
+        data = orjson.loads(body)
+        error_msg = f"Error editing file {filename}: {data.get('error', 'Unknown error')}"
         return display_rich_error(error_msg)
 
 
-@tool
-def vscode_health_check() -> str:
+@_tool
+async def vscode_health_check() -> str:
     """Check VS Code availability and connection status.
     
     Returns information about VS Code command availability and extension API status.
     """
-    code_available = check_code_command()
-    api_available = check_vscode_api()
+    # Always probe fresh when the user explicitly asks for a health check
+    check_code_command.cache_clear()
+    reset_vscode_api_cache()
+    
+    code_available, api_available = await asyncio.gather(
+        _blocking(check_code_command),
+        _blocking(check_vscode_api)
+    )
     
     status_info = f"""[bold cyan]VS Code Health Check:[/bold cyan]
 